@@ -1,5 +1,3 @@
-from typing import Iterator
-
 from game_board import GameBoard
 from players import AbstractPlayer
 
@@ -13,11 +11,6 @@ class Game:
         self._game_board = game_board
         self._sos_count = 0
 
-    def _next_player_generator(self) -> Iterator[AbstractPlayer]:
-        while True:
-            yield self._player_1
-            yield self._player_2
-
     def _print_game_result(self):
         print(self._player_1)
         print(self._player_2)
@@ -33,8 +26,9 @@ class Game:
 
     def run(self):
         self._game_board.print_game_board()
-        players_iterator = self._next_player_generator()
-        current_player = next(players_iterator)
+        players = (self._player_1, self._player_2)
+        player_index = 0
+        current_player = players[player_index]
 
         while self._game_board.has_empty_locations():
             move = current_player.make_move(self._game_board)
@@ -47,7 +41,8 @@ class Game:
                 current_player.update_score(score)
                 print(f"{current_player} got {score} point(s)\n")
             else:
-                current_player = next(players_iterator)
+                player_index ^= 1
+                current_player = players[player_index]
 
             self._game_board.print_game_board()
 
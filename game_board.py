@@ -1,106 +1,203 @@
 from __future__ import annotations
 
+import random
+
 from location import Location
 from move import Move
 from sign import Sign
 
+EMPTY, LETTER_S, LETTER_O = 0, 1, 2
+
+_DIRS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+_SIGN_TO_INT = {Sign.EMPTY: EMPTY, Sign.LETTER_S: LETTER_S, Sign.LETTER_O: LETTER_O}
+_INT_TO_SIGN = (Sign.EMPTY, Sign.LETTER_S, Sign.LETTER_O)
+
 
 class GameBoard:
     def __init__(self, size: int = 4):
         self._size = size
-        self._board: list[list[Sign]] = self._create_empty_game_board()
+        self._s_mask = 0
+        self._o_mask = 0
+        self._full_mask = (1 << (size * size)) - 1
+        self._sos_count = 0
+        self._zobrist = [
+            (random.getrandbits(64), random.getrandbits(64))
+            for _ in range(size * size)
+        ]
+        self._hash = 0
+        self._triples_through = self._build_triples_through()
 
-    def _create_empty_game_board(self) -> list[list[Sign]]:
-        return [[Sign.EMPTY for _ in range(self._size)] for _ in range(self._size)]
+    def _build_triples_through(self) -> list[tuple[tuple[int, int], ...]]:
+        size = self._size
+        triples_through: list[list[tuple[int, int]]] = [
+            [] for _ in range(size * size)
+        ]
+        for x in range(size):
+            for y in range(size):
+                for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_x, end_y = x + 2 * dx, y + 2 * dy
+                    if not (0 <= end_x < size and 0 <= end_y < size):
+                        continue
+                    start = x * size + y
+                    mid = (x + dx) * size + y + dy
+                    end = end_x * size + end_y
+                    o_bit = 1 << mid
+                    s_bits = (1 << start) | (1 << end)
+                    for cell in (start, mid, end):
+                        triples_through[cell].append((o_bit, s_bits))
+        return [tuple(triples) for triples in triples_through]
 
     def get_size(self) -> int:
         return self._size
 
+    def _cell(self, idx: int) -> int:
+        if (self._s_mask >> idx) & 1:
+            return LETTER_S
+        if (self._o_mask >> idx) & 1:
+            return LETTER_O
+        return EMPTY
+
     def get_location_sign(self, location: Location) -> Sign:
-        return self._board[location.x][location.y]
+        return _INT_TO_SIGN[self._cell(location.x * self._size + location.y)]
 
     def print_game_board(self) -> None:
-        for row in self._board:
-            for i, space in enumerate(row):
-                print("|" if i == 0 else "", space + " |", end="")
-                if i == self.get_size() - 1:
+        for x in range(self._size):
+            for y in range(self._size):
+                sign = self.get_location_sign(Location(x, y))
+                print("|" if y == 0 else "", sign + " |", end="")
+                if y == self.get_size() - 1:
                     print("\n")
         print((self.get_size() * 4 + 1) * "—" + "\n")
 
     def play_move(self, move: Move) -> None:
-        self._board[move.location.x][move.location.y] = move.sign
-
-    def get_locations_with_sign(self, sign: Sign):
-        return [
-            Location(i, j)
-            for i, row in enumerate(self._board)
-            for j, element in enumerate(row)
-            if element == sign
-        ]
+        self.play_move_delta(move)
+
+    def play_move_delta(self, move: Move) -> int:
+        x, y = move.location.x, move.location.y
+        before = self._count_sos_through(x, y)
+        idx = x * self._size + y
+        self._clear_cell(idx)
+        bit = 1 << idx
+        value = _SIGN_TO_INT[move.sign]
+        if value == LETTER_S:
+            self._s_mask |= bit
+            self._hash ^= self._zobrist[idx][0]
+        elif value == LETTER_O:
+            self._o_mask |= bit
+            self._hash ^= self._zobrist[idx][1]
+        delta = self._count_sos_through(x, y) - before
+        self._sos_count += delta
+        return delta
+
+    def undo_move(self, move: Move, sos_delta: int) -> None:
+        self._clear_cell(move.location.x * self._size + move.location.y)
+        self._sos_count -= sos_delta
+
+    def place(self, x: int, y: int, value: int) -> int:
+        idx = x * self._size + y
+        if value == LETTER_S:
+            self._s_mask |= 1 << idx
+            self._hash ^= self._zobrist[idx][0]
+        else:
+            self._o_mask |= 1 << idx
+            self._hash ^= self._zobrist[idx][1]
+        delta = self._count_sos_through(x, y)
+        self._sos_count += delta
+        return delta
+
+    def clear(self, x: int, y: int, sos_delta: int) -> None:
+        self._clear_cell(x * self._size + y)
+        self._sos_count -= sos_delta
+
+    def _clear_cell(self, idx: int) -> None:
+        bit = 1 << idx
+        if self._s_mask & bit:
+            self._s_mask &= ~bit
+            self._hash ^= self._zobrist[idx][0]
+        elif self._o_mask & bit:
+            self._o_mask &= ~bit
+            self._hash ^= self._zobrist[idx][1]
+
+    def get_hash(self) -> int:
+        return self._hash
+
+    def _count_sos_through(self, x: int, y: int) -> int:
+        s_mask = self._s_mask
+        o_mask = self._o_mask
+        count = 0
+        for o_bit, s_bits in self._triples_through[x * self._size + y]:
+            if o_mask & o_bit and s_mask & s_bits == s_bits:
+                count += 1
+        return count
+
+    def get_locations_with_sign(self, sign: Sign) -> list[Location]:
+        value = _SIGN_TO_INT[sign]
+        if value == LETTER_S:
+            mask = self._s_mask
+        elif value == LETTER_O:
+            mask = self._o_mask
+        else:
+            mask = ~(self._s_mask | self._o_mask) & self._full_mask
+        n = self._size
+        locations = []
+        while mask:
+            bit = mask & -mask
+            idx = bit.bit_length() - 1
+            locations.append(Location(idx // n, idx % n))
+            mask ^= bit
+        return locations
 
     def get_empty_locations(self) -> list[Location]:
         return self.get_locations_with_sign(sign=Sign.EMPTY)
 
+    def get_empty_cells(self) -> list[tuple[int, int]]:
+        mask = ~(self._s_mask | self._o_mask) & self._full_mask
+        n = self._size
+        cells = []
+        while mask:
+            bit = mask & -mask
+            idx = bit.bit_length() - 1
+            cells.append((idx // n, idx % n))
+            mask ^= bit
+        return cells
+
     def has_empty_locations(self) -> bool:
-        return bool(self.get_empty_locations())
+        return (self._s_mask | self._o_mask) != self._full_mask
 
     def get_sos_count(self) -> int:
-        sos_count = 0
-        for i, row in enumerate(self._board):
-            for j, value in enumerate(row):
-                if value == Sign.LETTER_O:
-                    if j != 0 and j != self.get_size() - 1:
-                        if (
-                            self._board[i][j + 1] == Sign.LETTER_S
-                            and self._board[i][j - 1] == Sign.LETTER_S
-                        ):
-                            sos_count += 1  # horiz
-
-                    if i != 0 and i != self.get_size() - 1:
-                        if (
-                            self._board[i + 1][j] == Sign.LETTER_S
-                            and self._board[i - 1][j] == Sign.LETTER_S
-                        ):
-                            sos_count += 1  # vertical
-
-                    if (
-                        i != 0
-                        and i != self.get_size() - 1
-                        and j != 0
-                        and j != self.get_size() - 1
-                    ):
-                        if (
-                            self._board[i + 1][j + 1] == Sign.LETTER_S
-                            and self._board[i - 1][j - 1] == Sign.LETTER_S
-                        ):
-                            sos_count += 1  # neg diag
-
-                        if (
-                            self._board[i - 1][j + 1] == Sign.LETTER_S
-                            and self._board[i + 1][j - 1] == Sign.LETTER_S
-                        ):
-                            sos_count += 1  # pos diag
-        return sos_count
+        return self._sos_count
 
     def is_in_range(self, location: Location) -> bool:
         return 0 <= location.x < self._size and 0 <= location.y < self._size
 
+    def count_almost_sos(self) -> int:
+        n = self._size
+        count = 0
+        mask = self._s_mask
+        while mask:
+            bit = mask & -mask
+            idx = bit.bit_length() - 1
+            if self.is_almost_sos_cell(idx // n, idx % n):
+                count += 1
+            mask ^= bit
+        return count
+
     def is_almost_sos(self, location: Location) -> bool:
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                o_pos = Location(location.x + i, location.y + j)
-                s_pos = Location(location.x + 2 * i, location.y + 2 * j)
-                if self.is_in_range(s_pos):
-                    is_soe = (
-                        self.get_location_sign(o_pos) == Sign.LETTER_O
-                        and self.get_location_sign(s_pos) == Sign.EMPTY
-                    )
-                    is_ses = (
-                        self.get_location_sign(o_pos) == Sign.EMPTY
-                        and self.get_location_sign(s_pos) == Sign.LETTER_S
-                    )
-                    if is_soe or is_ses:
-                        return True
+        return self.is_almost_sos_cell(location.x, location.y)
+
+    def is_almost_sos_cell(self, x: int, y: int) -> bool:
+        n = self._size
+        for dx, dy in _DIRS:
+            s_x, s_y = x + 2 * dx, y + 2 * dy
+            if not (0 <= s_x < n and 0 <= s_y < n):
+                continue
+            o_value = self._cell((x + dx) * n + y + dy)
+            s_value = self._cell(s_x * n + s_y)
+            if (o_value == LETTER_O and s_value == EMPTY) or (
+                o_value == EMPTY and s_value == LETTER_S
+            ):
+                return True
 
         return False
 
@@ -113,4 +210,5 @@ class GameBoard:
         ):
             return False
 
-        return self._board[move.location.x][move.location.y] == Sign.EMPTY
\ No newline at end of file
+        bit = 1 << (move.location.x * self._size + move.location.y)
+        return not ((self._s_mask | self._o_mask) & bit)
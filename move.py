@@ -4,7 +4,7 @@ from location import Location
 from sign import Sign
 
 
-@dataclass
+@dataclass(slots=True)
 class Move:
     location: Location
     sign: Sign
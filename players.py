@@ -1,17 +1,30 @@
+import functools
 import itertools
 import math
 import random
+import time
 from abc import ABC, abstractmethod
 from enum import Enum
 
-from game_board import GameBoard
+from game_board import LETTER_O, LETTER_S, GameBoard
 from location import Location
 from move import Move
+from search import alpha_beta
 from sign import Sign
 
 MIN_AGENT = 1
 MAX_AGENT = 0
 
+VALID_SIGNS = Sign.get_input_valid_signs()
+VALID_SIGN_VALUES = (LETTER_S, LETTER_O)
+
+_SIGN_BY_VALUE = {LETTER_S: Sign.LETTER_S, LETTER_O: Sign.LETTER_O}
+
+
+@functools.lru_cache(maxsize=None)
+def _total_node_count(empty_locations: int, depth: int) -> int:
+    return 2**depth * math.perm(empty_locations, depth)
+
 
 class PlayerType(Enum):
     USER_PLAYER = 1
@@ -20,10 +33,11 @@ class PlayerType(Enum):
 
 
 class AbstractPlayer(ABC):
-    _score: int = 0
+    __slots__ = ("_score",)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._score = 0
 
     @abstractmethod
     def make_move(self, game_board: GameBoard) -> Move:
@@ -53,17 +67,21 @@ class AbstractPlayer(ABC):
 
 
 class RandomPlayer(AbstractPlayer):
+    __slots__ = ()
+
     def get_type(self) -> PlayerType:
         return PlayerType.RANDOM_PLAYER
 
     def make_move(self, game_board: GameBoard) -> Move:
         empty_locations: list[Location] = game_board.get_empty_locations()
         location: Location = random.choice(empty_locations)
-        sign: Sign = Sign(random.choice(Sign.get_input_valid_signs()))
+        sign: Sign = random.choice(VALID_SIGNS)
         return Move(location, sign)
 
 
 class UserPlayer(AbstractPlayer):
+    __slots__ = ()
+
     def get_type(self) -> PlayerType:
         return PlayerType.USER_PLAYER
 
@@ -96,9 +114,15 @@ class UserPlayer(AbstractPlayer):
 
 
 class MiniMax_AlphaBeta_Player(AbstractPlayer):
-    def __init__(self, *args, depth: int, **kwargs) -> None:
+    __slots__ = ("_depth", "_time_limit", "_tt")
+
+    def __init__(
+        self, *args, depth: int, time_limit: float | None = None, **kwargs
+    ) -> None:
         super().__init__(*args, **kwargs)
         self._depth = depth
+        self._time_limit = time_limit
+        self._tt: dict[tuple[int, bool], tuple] = {}
 
     def get_type(self) -> PlayerType:
         return PlayerType.MINIMAX_PLAYER_Alpha_Beta
@@ -106,38 +130,61 @@ class MiniMax_AlphaBeta_Player(AbstractPlayer):
     def _count_pruned_nodes_percentage(
         self, game_board: GameBoard, skipped_node_count: int
     ) -> float:
-        empty_locations = len(game_board.get_empty_locations())
-        total_nodes = math.prod(
-            map(
-                lambda x: x * 2,
-                range(empty_locations - self._depth + 1, empty_locations + 1),
-            )
-        )
-
+        total_nodes = _total_node_count(len(game_board.get_empty_cells()), self._depth)
         return 100 * skipped_node_count / total_nodes if total_nodes else 0
 
     def make_move(self, game_board: GameBoard) -> Move:
-        best_move = Move(Location(0, 0), Sign.EMPTY)
-        best_score = float("-inf")
+        start_time = time.monotonic()
+        best_child = None
 
-        scores = []
         skipped_node_count = [0]
-        for location, sign in itertools.product(
-            game_board.get_empty_locations(), Sign.get_input_valid_signs()
-        ):
-            game_board.play_move(Move(location, sign))
-            current_score = self._minimax_alpha_beta(
-                game_board, self._depth, False, skipped_node_count
-            )
-
-            scores.append(current_score)
-            game_board.play_move(Move(location, Sign.EMPTY))
-            if current_score > best_score:
-                best_score = current_score
-                best_move = Move(location, sign)
-
-        if best_score == min(scores):
+        pv_child = None
+        empties = game_board.get_empty_cells()
+        children = list(itertools.product(empties, VALID_SIGN_VALUES))
+        for depth in range(1, self._depth + 1):
+            if (
+                self._time_limit is not None
+                and depth > 1
+                and time.monotonic() - start_time > self._time_limit
+            ):
+                break
+
+            if pv_child is not None:
+                children.remove(pv_child)
+                children.insert(0, pv_child)
+
+            depth_best_child = best_child
+            depth_best_score = float("-inf")
+            for cell, value in children:
+                i = empties.index(cell)
+                empties[i], empties[-1] = empties[-1], empties[i]
+                empties.pop()
+                x, y = cell
+                sos_delta = game_board.place(x, y, value)
+                current_score = sos_delta + alpha_beta(
+                    game_board,
+                    self._tt,
+                    empties,
+                    depth,
+                    sos_delta != 0,
+                    skipped_node_count,
+                )
+
+                game_board.clear(x, y, sos_delta)
+                empties.append(cell)
+                empties[i], empties[-1] = empties[-1], empties[i]
+                if current_score > depth_best_score:
+                    depth_best_score = current_score
+                    depth_best_child = (cell, value)
+                    pv_child = (cell, value)
+
+            best_child = depth_best_child
+
+        if best_child is None:
             best_move = self._smart_random_move(game_board)
+        else:
+            (x, y), value = best_child
+            best_move = Move(Location(x, y), _SIGN_BY_VALUE[value])
 
         print(
             f"Alpha-Beta pruned {self._count_pruned_nodes_percentage(game_board, skipped_node_count[0])}% of the nodes."
@@ -148,85 +195,44 @@ class MiniMax_AlphaBeta_Player(AbstractPlayer):
     def _random_move(self, game_board: GameBoard) -> Move:
         return RandomPlayer().make_move(game_board)
 
-    def _block_evaluation(self, game_board: GameBoard) -> float:
-        score = 1
-        for location in game_board.get_locations_with_sign(Sign.LETTER_S):
-            if game_board.is_almost_sos(location):
-                score += 1
-
-        return 1 / score
-
-    def _smart_random_move(self, game_board: GameBoard) -> Move:
-        best_moves = []
-        for location, sign in itertools.product(
-            game_board.get_empty_locations(), Sign.get_input_valid_signs()
-        ):
-            game_board.play_move(Move(location, sign))
-            score = self._block_evaluation(game_board)
-            if score == 1:
-                best_moves.append(Move(location, sign))
-            game_board.play_move(Move(location, Sign.EMPTY))
-
-        return (
-            random.choice(best_moves) if best_moves else self._random_move(game_board)
-        )
-
-    def _simple_score_evaluation(self, game_board: GameBoard) -> int:
-        return game_board.get_sos_count()
-
-    def _minimax_alpha_beta(
+    def _block_delta(
         self,
         game_board: GameBoard,
-        depth: int,
-        is_max_turn: bool,
-        skipped_node_count: list,
-        alpha: float = float("-inf"),
-        beta: float = float("inf"),
-    ) -> float:
+        x: int,
+        y: int,
+        value: int,
+        near_flags: list[tuple[int, int, bool]],
+    ) -> int:
+        delta = 0
+        for s_x, s_y, flag in near_flags:
+            delta += game_board.is_almost_sos_cell(s_x, s_y) - flag
+        if value == LETTER_S:
+            delta += game_board.is_almost_sos_cell(x, y)
+        return delta
 
-        if depth == 0 or not game_board.has_empty_locations():
-            return self._simple_score_evaluation(game_board)
-
-        if is_max_turn:
-            best_score = float("-inf")
-            for location, sign in itertools.product(
-                game_board.get_empty_locations(), Sign.get_input_valid_signs()
-            ):
-                sos_count = game_board.get_sos_count()
-                game_board.play_move(Move(location, sign))
-                new_sos_count = game_board.get_sos_count()
-                diff = new_sos_count - sos_count
-                if diff == 0:
-                    is_max_turn = not is_max_turn
-                score = self._minimax_alpha_beta(
-                    game_board, depth - 1, is_max_turn, skipped_node_count, alpha, beta
-                )
-                game_board.play_move(Move(location, Sign.EMPTY))
-                best_score = max(best_score, score)
-                alpha = max(alpha, best_score)
-                if beta <= alpha:
-                    skipped_node_count[0] += 1
-                    break
-
-            return best_score
-        else:
-            best_score = float("inf")
-            for location, sign in itertools.product(
-                game_board.get_empty_locations(), Sign.get_input_valid_signs()
-            ):
-                sos_count = game_board.get_sos_count()
-                game_board.play_move(Move(location, sign))
-                new_sos_count = game_board.get_sos_count()
-                diff = new_sos_count - sos_count
-                if diff == 0:
-                    is_max_turn = not is_max_turn
-                score = self._minimax_alpha_beta(
-                    game_board, depth - 1, is_max_turn, skipped_node_count, alpha, beta
-                )
-                game_board.play_move(Move(location, Sign.EMPTY))
-                best_score = min(best_score, score)
-                beta = min(beta, best_score)
-                if beta <= alpha:
-                    skipped_node_count[0] += 1
-                    break
-            return best_score
+    def _smart_random_move(self, game_board: GameBoard) -> Move:
+        s_flags = [
+            (location.x, location.y, game_board.is_almost_sos(location))
+            for location in game_board.get_locations_with_sign(Sign.LETTER_S)
+        ]
+        base_almost = sum(flag for _, _, flag in s_flags)
+
+        best_children = []
+        for (x, y), value in itertools.product(
+            game_board.get_empty_cells(), VALID_SIGN_VALUES
+        ):
+            near_flags = [
+                (s_x, s_y, flag)
+                for s_x, s_y, flag in s_flags
+                if abs(s_x - x) <= 2 and abs(s_y - y) <= 2
+            ]
+            sos_delta = game_board.place(x, y, value)
+            if base_almost + self._block_delta(game_board, x, y, value, near_flags) == 0:
+                best_children.append((x, y, value))
+            game_board.clear(x, y, sos_delta)
+
+        if not best_children:
+            return self._random_move(game_board)
+
+        x, y, value = random.choice(best_children)
+        return Move(Location(x, y), _SIGN_BY_VALUE[value])
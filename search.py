@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from game_board import LETTER_O, LETTER_S, GameBoard
+
+_VALID_SIGNS = (LETTER_S, LETTER_O)
+
+TIEBREAK_EPSILON = 1e-3
+
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+TT_MAX_SIZE = 1 << 20
+
+
+def alpha_beta(
+    game_board: GameBoard,
+    tt: dict,
+    empties: list[tuple[int, int]],
+    depth: int,
+    is_max_turn: bool,
+    skipped_node_count: list,
+    alpha: float = float("-inf"),
+    beta: float = float("inf"),
+) -> float:
+
+    if depth == 0 or not empties:
+        return _leaf_evaluation(game_board, is_max_turn)
+
+    tt_key = (game_board.get_hash(), is_max_turn)
+    entry = tt.get(tt_key)
+    tt_child = None
+    if entry is not None:
+        tt_child = entry[3]
+        if entry[0] >= depth:
+            tt_value, tt_flag = entry[1], entry[2]
+            if tt_flag == TT_EXACT:
+                return tt_value
+            if tt_flag == TT_LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if beta <= alpha:
+                return tt_value
+
+    first_signs = _VALID_SIGNS
+    tt_index = None
+    if tt_child is not None:
+        tt_cell, tt_sign = tt_child
+        try:
+            tt_index = empties.index(tt_cell)
+        except ValueError:
+            pass
+        else:
+            empties[0], empties[tt_index] = empties[tt_index], empties[0]
+            first_signs = (tt_sign,) + tuple(
+                sign for sign in _VALID_SIGNS if sign != tt_sign
+            )
+
+    alpha_entry, beta_entry = alpha, beta
+    best_child = None
+    best_score = float("-inf") if is_max_turn else float("inf")
+    cutoff = False
+    for i in range(len(empties)):
+        empties[i], empties[-1] = empties[-1], empties[i]
+        cell = empties.pop()
+        x, y = cell
+        for sign in first_signs if i == 0 else _VALID_SIGNS:
+            diff = game_board.place(x, y, sign)
+            next_is_max = is_max_turn if diff else not is_max_turn
+            gain = diff if is_max_turn else -diff
+            score = gain + alpha_beta(
+                game_board,
+                tt,
+                empties,
+                depth - 1,
+                next_is_max,
+                skipped_node_count,
+                alpha - gain,
+                beta - gain,
+            )
+            game_board.clear(x, y, diff)
+            if is_max_turn:
+                if score > best_score:
+                    best_score = score
+                    best_child = (cell, sign)
+                alpha = max(alpha, best_score)
+            else:
+                if score < best_score:
+                    best_score = score
+                    best_child = (cell, sign)
+                beta = min(beta, best_score)
+            if beta <= alpha:
+                skipped_node_count[0] += 1
+                cutoff = True
+                break
+        empties.append(cell)
+        empties[i], empties[-1] = empties[-1], empties[i]
+        if cutoff:
+            break
+
+    if tt_index is not None:
+        empties[0], empties[tt_index] = empties[tt_index], empties[0]
+
+    _tt_store(tt, tt_key, depth, best_score, best_child, alpha_entry, beta_entry)
+    return best_score
+
+
+def _leaf_evaluation(game_board: GameBoard, is_max_turn: bool) -> float:
+    threats = game_board.count_almost_sos()
+    positional = TIEBREAK_EPSILON * threats / (1 + threats)
+    return positional if is_max_turn else -positional
+
+
+def _tt_store(
+    tt: dict,
+    key: tuple[int, bool],
+    depth: int,
+    value: float,
+    best_child: tuple | None,
+    alpha: float,
+    beta: float,
+) -> None:
+    entry = tt.get(key)
+    if entry is not None and entry[0] > depth:
+        return
+    if entry is None and len(tt) >= TT_MAX_SIZE:
+        return
+
+    if value <= alpha:
+        flag = TT_UPPER
+    elif value >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    tt[key] = (depth, value, flag, best_child)
@@ -9,12 +9,16 @@ class Sign(str, Enum):
     EMPTY = "_"
 
     @classmethod
-    def get_input_valid_signs(cls) -> list[Sign]:
-        return [cls.LETTER_S, cls.LETTER_O]
+    def get_input_valid_signs(cls) -> tuple[Sign, ...]:
+        return cls._VALID
 
     @classmethod
     def from_user_input(cls, s: str) -> Sign:
-        if Sign(s) not in cls.get_input_valid_signs():
+        sign = cls(s)
+        if sign not in cls._VALID:
             raise ValueError("Invalid input")
 
-        return cls(s)
+        return sign
+
+
+Sign._VALID = (Sign.LETTER_S, Sign.LETTER_O)